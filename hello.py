@@ -2,10 +2,17 @@
 #
 # This is a Streamlit web application for your stock news app.
 # -- NOW INCLUDES SENTIMENT ANALYSIS --
+# Headlines are labelled with a fast approximation of VADER (lexicon scores
+# plus its negation rule). It agrees with full VADER on most headlines but
+# can differ on "but" clauses and some phrases; see stock_news/sentiment.py.
+#
+# The stock list, news and sentiment code lives in the stock_news package
+# (shared with the command-line version in share.py). This file only
+# adds Streamlit caching, progress messages and the UI.
 #
 # --- PREREQUISITES ---
 # You MUST install the required libraries first by running:
-# pip install pandas newsapi-python nsetools streamlit vaderSentiment
+# pip install pandas numpy requests numba aiohttp orjson streamlit pyarrow vaderSentiment
 #
 # --- HOW TO RUN ---
 # 1. Save this file as stock_news_app.py
@@ -17,24 +24,21 @@
 # 1. You MUST get a free API key from https://newsapi.org/
 # 2. Paste your API key into the text box in the app's sidebar.
 
+import html
 import pandas as pd
-from newsapi import NewsApiClient
-from nsetools import Nse
-from datetime import datetime, timedelta
-import json
+import numpy as np
 import streamlit as st
 
-# --- NEW: Import for Sentiment Analysis ---
-from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
-
-# Initialize the VADER sentiment analyzer
-analyzer = SentimentIntensityAnalyzer()
+from stock_news import news, stocks
+from stock_news.dates import get_date_range
+from stock_news.sentiment import SENTIMENT_EMOJIS, SENTIMENT_LABELS, score_titles
 
-# --- 2. STOCK LIST FUNCTIONS (with Caching) ---
+# --- 1. STOCK LIST FUNCTIONS (with Caching) ---
 # @st.cache_data tells Streamlit to store the result of these functions
 # so we don't re-download the list every time the app refreshes.
+# The lists are also saved to disk by stock_news.stocks and refreshed once a day.
 
-@st.cache_data
+@st.cache_data(ttl=stocks.CACHE_TTL_SECONDS, show_spinner=False)
 def get_fno_stocks():
     """
     Fetches the current list of F&O (Futures & Options) stocks
@@ -42,42 +46,68 @@ def get_fno_stocks():
     """
     st.write("Cache miss: Fetching F&O stock list...")
     try:
-        fno_csv_url = "https://archives.nseindia.com/content/fo/fo_mktlots.csv"
-        df = pd.read_csv(fno_csv_url, skiprows=1)
-        symbol_column = df.columns[1]
-        stock_list = df[symbol_column].str.strip().str.upper().tolist()
+        stock_list = stocks.get_fno_stocks()
         st.write(f"Found {len(stock_list)} F&O stocks.")
         return stock_list
     except Exception as e:
         st.error(f"Error fetching F&O stocks: {e}")
         return []
 
-@st.cache_data
-def get_index_stocks(index_name):
+class IndexFetchError(Exception):
     """
-    A helper function to get all stock symbols for a given Nifty index
-    using the 'nsetools' library.
+    Raised by _load_index_stocks() when some indices failed to download.
+    Carries the lists that did succeed, so they can still be used.
     """
-    st.write(f"Cache miss: Fetching stock list for {index_name}...")
+    def __init__(self, index_stocks, errors):
+        super().__init__(f"Failed to fetch: {', '.join(errors)}")
+        self.index_stocks = index_stocks
+        self.errors = errors
+
+# Successful loads are cached for a day. st.cache_data doesn't cache
+# exceptions, so raising on any failure keeps a partial result out of
+# this cache.
+@st.cache_data(ttl=stocks.CACHE_TTL_SECONDS, show_spinner=False)
+def _load_index_stocks():
+    index_stocks, errors = stocks.get_all_index_stocks()
+    if errors:
+        raise IndexFetchError(index_stocks, errors)
+    return index_stocks
+
+# Failures are cached too, but only for a minute, so a host that NSE
+# blocks doesn't wait on it again on every widget change.
+INDEX_RETRY_SECONDS = 60
+
+@st.cache_data(ttl=INDEX_RETRY_SECONDS, show_spinner=False)
+def _try_load_index_stocks():
     try:
-        nse = Nse()
-        if not nse.is_valid_index(index_name):
-            st.error(f"Error: Invalid index name '{index_name}'.")
-            valid_indices = nse.get_index_list()
-            st.info(f"Valid indices include: {', '.join(valid_indices)}")
-            return []
-            
-        stock_list = nse.get_stocks_in_index(index_name)
-        
-        if not stock_list:
-            st.warning(f"No stocks returned for {index_name}.")
-            return []
-            
-        st.write(f"Found {len(stock_list)} stocks in {index_name}.")
-        return [stock.upper() for stock in stock_list]
+        return _load_index_stocks(), {}
+    except IndexFetchError as e:
+        return e.index_stocks, {name: str(err) for name, err in e.errors.items()}
     except Exception as e:
-        st.error(f"Error fetching index stocks: {e}")
+        return {}, {name: str(e) for name in stocks.INDEX_NAMES}
+
+def get_all_index_stocks():
+    """
+    Gets the stock lists for every index in stocks.INDEX_NAMES in one
+    concurrent fetch, so switching between them afterwards is instant.
+    Returns (index_stocks, errors): dicts of index name -> list of symbols
+    and index name -> error message.
+    """
+    return _try_load_index_stocks()
+
+def get_index_stocks(index_name):
+    """
+    Returns all stock symbols for a given Nifty index.
+    """
+    if index_name not in stocks.INDEX_NAMES:
+        st.error(f"Error: Invalid index name '{index_name}'.")
+        st.info(f"Valid indices include: {', '.join(stocks.INDEX_NAMES)}")
+        return []
+    index_stocks, errors = get_all_index_stocks()
+    if index_name in errors:
+        st.error(f"Error fetching {index_name}: {errors[index_name]}")
         return []
+    return index_stocks.get(index_name, [])
 
 def get_largecap_stocks():
     return get_index_stocks("NIFTY 100")
@@ -88,29 +118,7 @@ def get_midcap_stocks():
 def get_smallcap_stocks():
     return get_index_stocks("NIFTY SMALLCAP 250")
 
-# --- 3. DATE HELPER FUNCTIONS ---
-
-def get_date_range(period_name):
-    """
-    Returns a (from_date, to_date) tuple in ISO format (YYYY-MM-DD)
-    based on the period name.
-    """
-    today = datetime.now()
-    
-    if period_name == "last_week":
-        from_date = today - timedelta(days=7)
-    elif period_name == "last_4_weeks":
-        from_date = today - timedelta(weeks=4)
-    elif period_name == "last_3_months":
-        from_date = today - timedelta(days=90)
-    elif period_name == "last_6_months":
-        from_date = today - timedelta(days=180)
-    else:
-        from_date = today - timedelta(days=7) # Default
-
-    return from_date.strftime("%Y-%m-%d"), today.strftime("%Y-%m-%d")
-
-# --- 4. NEWS API FUNCTION ---
+# --- 2. NEWS API FUNCTION ---
 
 def fetch_news_for_stocks(api_key, stock_list, from_date, to_date):
     """
@@ -125,58 +133,36 @@ def fetch_news_for_stocks(api_key, stock_list, from_date, to_date):
         st.warning("No stock list provided. Skipping news fetch.")
         return []
 
-    stocks_for_query = stock_list[:15]
-    query = f"({' OR '.join(stocks_for_query)}) AND (stock OR market OR NSE OR BSE)"
+    queries = news.build_news_queries(stock_list)
 
-    st.write(f"Fetching news with query: {query[:100]}...")
+    st.write(f"Fetching news for {len(stock_list)} stocks in {len(queries)} batches...")
     st.write(f"Date Range: {from_date} to {to_date}")
     
     try:
-        newsapi = NewsApiClient(api_key=api_key)
-        
-        with st.spinner(f"Searching for news about {stocks_for_query[0]}..."):
-            all_articles = newsapi.get_everything(
-                q=query,
-                from_param=from_date,
-                to=to_date,
-                language='en',
-                sort_by='publishedAt',
-                page_size=50
+        with st.spinner(f"Searching for news about {len(stock_list)} stocks..."):
+            articles, errors = news.fetch_news_for_stocks(
+                api_key, stock_list, from_date, to_date, queries=queries
             )
+
+        if errors:
+            st.warning(
+                f"{len(errors)} of {len(queries)} batches failed, showing the rest. "
+                f"First error: {errors[0][1]}"
+            )
+
+        st.success(f"Found {len(articles)} unique articles.")
         
-        st.success(f"Found {all_articles['totalResults']} total articles.")
-        
-        if all_articles['totalResults'] == 0:
+        if not articles:
             st.info("No news found for this query and date range.")
             return []
 
-        return all_articles['articles']
+        return articles
 
     except Exception as e:
         st.error(f"Error fetching news from NewsAPI: {e}")
         return []
 
-
-# --- 5. NEW SENTIMENT FUNCTION ---
-def get_sentiment(text):
-    """
-    Analyzes the sentiment of a text string.
-    Returns 'Positive', 'Negative', or 'Neutral' and an emoji.
-    """
-    # Get sentiment scores
-    score = analyzer.polarity_scores(text)
-    
-    # 'compound' score is a good overall measure
-    compound = score['compound']
-    
-    if compound >= 0.05:
-        return "Positive", "🟢"
-    elif compound <= -0.05:
-        return "Negative", "🔴"
-    else:
-        return "Neutral", "⚪"
-
-# --- 6. STREAMLIT APP UI ---
+# --- 3. STREAMLIT APP UI ---
 
 # Set wide layout
 st.set_page_config(layout="wide")
@@ -215,6 +201,63 @@ period_label = st.sidebar.selectbox(
     options=list(period_options.keys())
 )
 
+# --- Article list ---
+# The filter and page widgets live inside a fragment, so changing them
+# only reruns this block instead of the whole page.
+ARTICLES_PER_PAGE = 20
+
+@st.fragment
+def _render_articles(articles, published, labels):
+    choice = st.radio(
+        "Filter by sentiment",
+        options=("All",) + SENTIMENT_LABELS,
+        horizontal=True,
+    )
+    if choice == "All":
+        indices = np.arange(len(articles))
+    else:
+        indices = np.flatnonzero(labels == SENTIMENT_LABELS.index(choice))
+
+    if len(indices) == 0:
+        st.info(f"No {choice.lower()} articles to display.")
+        return
+
+    num_pages = (len(indices) - 1) // ARTICLES_PER_PAGE + 1
+    page = 1
+    if num_pages > 1:
+        page = st.number_input("Page", min_value=1, max_value=num_pages, value=1)
+    start = (page - 1) * ARTICLES_PER_PAGE
+    st.caption(f"Showing {start + 1}-{min(start + ARTICLES_PER_PAGE, len(indices))} of {len(indices)} articles")
+
+    for i in indices[start:start + ARTICLES_PER_PAGE]:
+        article = articles[i]
+
+        sentiment = SENTIMENT_LABELS[labels[i]]
+        emoji = SENTIMENT_EMOJIS[labels[i]]
+        
+        with st.container(border=True):
+            col1, col2 = st.columns([3, 1])
+            with col1:
+                # Everything in one markdown block: one element per article
+                # instead of one per line
+                lines = [
+                    f"**{article['title']}**",
+                    f"**Sentiment: {emoji} {sentiment}**",
+                    f"Source: {article['source']['name']} | Published: {published[i]}",
+                ]
+                # Show description only if it exists
+                if article.get('description'):
+                    lines.append(article['description'])
+                lines.append(f"[Read Full Article]({article['url']})")
+                st.markdown("\n\n".join(lines))
+            with col2:
+                # Plain <img> tag: the browser fetches the image itself and
+                # skips off-screen ones, instead of Streamlit proxying every image
+                url = article.get('urlToImage')
+                if url:
+                    st.markdown(f'<img src="{html.escape(url)}" loading="lazy" style="width:100%">',
+                                unsafe_allow_html=True)
+
 # Fetch button
 if st.sidebar.button("Get News", type="primary"):
     
@@ -240,35 +283,45 @@ if st.sidebar.button("Get News", type="primary"):
     # 3. Fetch news
     articles = fetch_news_for_stocks(api_key, stock_list, from_date, to_date)
 
-    # 4. Display articles
+    # 4. Score and format once, then keep the results in session_state
+    # so later reruns (e.g. paging through the results) don't redo the work
+    labels, published = [], []
     if articles:
-        st.subheader(f"Showing Top {len(articles)} Articles")
-        
-        for article in articles:
-            
-            # --- NEW: Get sentiment for each title ---
-            sentiment, emoji = get_sentiment(article['title'])
-            
-            with st.container(border=True):
-                col1, col2 = st.columns([3, 1])
-                with col1:
-                    # --- NEW: Display sentiment with title ---
-                    st.write(f"**{article['title']}**")
-                    st.write(f"**Sentiment: {emoji} {sentiment}**")
-                    
-                    st.write(f"Source: {article['source']['name']} | Published: {pd.to_datetime(article['publishedAt']).strftime('%d-%b-%Y %H:%M')}")
-                    
-                    # Show description only if it exists
-                    if article['description']:
-                        st.write(article['description'])
-                        
-                    st.markdown(f"[Read Full Article]({article['url']})", unsafe_allow_html=True)
-                with col2:
-                    if article['urlToImage']:
-                        st.image(article['urlToImage'])
+        labels = score_titles([a['title'] for a in articles])
+        # Format all publish dates in one vectorized call
+        published = pd.to_datetime(
+            [a['publishedAt'] for a in articles], utc=True, format="ISO8601"
+        ).strftime('%d-%b-%Y %H:%M')
+
+    st.session_state['articles'] = articles
+    st.session_state['article_labels'] = labels
+    st.session_state['article_published'] = published
+    st.session_state['articles_for'] = (stock_list_label, period_label)
+
+# 5. Display articles
+if 'articles' in st.session_state:
+    articles = st.session_state['articles']
+    shown_list, shown_period = st.session_state['articles_for']
+    if (shown_list, shown_period) != (stock_list_label, period_label):
+        st.info(
+            f"Showing results for {shown_list} / {shown_period}. "
+            "Press 'Get News' to update."
+        )
+    if articles:
+        # Sentiment summary: count each label code in one pass
+        counts = np.bincount(st.session_state['article_labels'], minlength=len(SENTIMENT_LABELS))
+        st.subheader("Sentiment Overview")
+        st.caption("Sentiment is estimated from each headline and can be wrong on mixed or subtle headlines.")
+        st.bar_chart(pd.Series(counts, index=SENTIMENT_LABELS, name="Articles"))
+
+        st.subheader(f"Top {len(articles)} Articles")
+        _render_articles(
+            articles,
+            st.session_state['article_published'],
+            st.session_state['article_labels'],
+        )
     else:
         st.info("No articles found to display.")
-
 else:
     st.info("Configure your settings in the sidebar and press 'Get News'.")
 
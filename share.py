@@ -1,20 +1,19 @@
 #stock_news_app.py
 #
 # This is a Python script that provides the foundation for your stock news app.
+# The stock list and news code lives in the stock_news package (shared with
+# the Streamlit app in hello.py); this file is the command-line front end.
 #
 # --- PREREQUISITES ---
 # You MUST install the required libraries first by running:
-# pip install pandas newsapi-python nsetools
+# pip install requests aiohttp orjson pyarrow
 ## 
 # --- IMPORTANT SETUP ---
 # 1. You MUST get a free API key from https://newsapi.org/
 # 2. Paste your API key in the `CONFIG` section below.
 
-import pandas as pd
-from newsapi import NewsApiClient
-from nsetools import Nse
-from datetime import datetime, timedelta
-import json
+from stock_news import news, stocks
+from stock_news.dates import get_date_range
 
 # --- 1. CONFIGURATION ---
 # !IMPORTANT!: Paste your NewsAPI key here
@@ -30,20 +29,7 @@ def get_fno_stocks():
     """
     print("Fetching F&O stock list...")
     try:
-        # This URL points to the official NSE CSV file for F&O market lots
-        fno_csv_url = "https://archives.nseindia.com/content/fo/fo_mktlots.csv"
-        
-        # Read the CSV file directly using pandas
-        # We skip the first row (index 0) which is a header
-        df = pd.read_csv(fno_csv_url, skiprows=1)
-        
-        # The stock symbols are in the second column (index 1)
-        # We'll get the column name from the data itself
-        symbol_column = df.columns[1]
-        
-        # Get the list of symbols, convert to uppercase, and remove any whitespace
-        stock_list = df[symbol_column].str.strip().str.upper().tolist()
-        
+        stock_list = stocks.get_fno_stocks()
         print(f"Found {len(stock_list)} F&O stocks.")
         return stock_list
     except Exception as e:
@@ -53,29 +39,15 @@ def get_fno_stocks():
 
 def get_index_stocks(index_name):
     """
-    A helper function to get all stock symbols for a given Nifty index
-    using the 'nsetools' library.
+    A helper function to get all stock symbols for a given Nifty index.
     
     Valid index_name examples: 'NIFTY 50', 'NIFTY MIDCAP 150', 'NIFTY SMALLCAP 250'
     """
     print(f"Fetching stock list for {index_name}...")
     try:
-        nse = Nse()
-        # get_stock_codes() on its own is unreliable, get_index_quote is better
-        # A more robust way is to get the list for an index
-        if not nse.is_valid_index(index_name):
-            print(f"Error: Invalid index name '{index_name}'.")
-            print(f"Valid indices include: {', '.join(nse.get_index_list())}")
-            return []
-            
-        stock_list = nse.get_stocks_in_index(index_name)
-        
-        if not stock_list:
-            print(f"No stocks returned for {index_name}. The library may need an update or the index name is wrong.")
-            return []
-            
+        stock_list = stocks.get_index_stocks(index_name)
         print(f"Found {len(stock_list)} stocks in {index_name}.")
-        return [stock.upper() for stock in stock_list]
+        return stock_list
     except Exception as e:
         print(f"Error fetching index stocks: {e}")
         return []
@@ -94,31 +66,7 @@ def get_smallcap_stocks():
     return get_index_stocks("NIFTY SMALLCAP 250")
 
 # --- 3. DATE HELPER FUNCTIONS ---
-# These functions calculate the 'from' and 'to' dates for the API.
-
-def get_date_range(period_name):
-    """
-    Returns a (from_date, to_date) tuple in ISO format (YYYY-MM-DD)
-    based on the period name.
-    """
-    today = datetime.now()
-    
-    if period_name == "last_week":
-        from_date = today - timedelta(days=7)
-    elif period_name == "last_4_weeks":
-        from_date = today - timedelta(weeks=4)
-    elif period_name == "last_3_months":
-        # Using 90 days as an approximation for 3 months
-        from_date = today - timedelta(days=90)
-    elif period_name == "last_6_months":
-        # Using 180 days as an approximation for 6 months
-        from_date = today - timedelta(days=180)
-    else:
-        # Default to last 7 days
-        from_date = today - timedelta(days=7)
-
-    # Format dates as 'YYYY-MM-DD' strings
-    return from_date.strftime("%Y-%m-%d"), today.strftime("%Y-%m-%d")
+# get_date_range() comes from stock_news.dates (see the imports above).
 
 # --- 4. NEWS API FUNCTION ---
 
@@ -129,7 +77,7 @@ def fetch_news_for_stocks(stock_list, from_date, to_date):
     if NEWS_API_KEY == "YOUR_API_KEY_HERE":
         print("="*50)
         print("ERROR: Please update the 'NEWS_API_KEY' variable")
-        print("in the CONFIG section (line 21) with your key from newsapi.org.")
+        print("in the CONFIG section with your key from newsapi.org.")
         print("="*50)
         return
 
@@ -137,43 +85,31 @@ def fetch_news_for_stocks(stock_list, from_date, to_date):
         print("No stock list provided. Skipping news fetch.")
         return
 
-    # --- NewsAPI Query Limitation ---
-    # NewsAPI has a limit on query length (1024 chars on free plan).
-    # We cannot OR all 500+ stocks.
-    # Strategy: We take the first 10-15 stocks and create a query.
-    # A better app would fetch news for each stock individually or in small batches.
-    
-    stocks_for_query = stock_list[:15] # Take the first 15 stocks
-    
-    # Create a query like: "(RELIANCE OR TCS OR INFY) AND (stock OR NSE OR BSE)"
-    # We add terms like "stock" or "NSE" to focus the search.
-    query = f"({' OR '.join(stocks_for_query)}) AND (stock OR market OR NSE OR BSE)"
+    # NewsAPI limits query length, so the stocks are searched in
+    # batches of news.STOCKS_PER_QUERY (all batches run concurrently).
+    queries = news.build_news_queries(stock_list)
 
     print(f"\n--- Fetching News ---")
-    print(f"Query: {query}")
+    print(f"Stocks: {len(stock_list)} in {len(queries)} batches")
     print(f"From: {from_date} To: {to_date}")
     
     try:
-        newsapi = NewsApiClient(api_key=NEWS_API_KEY)
-        
-        all_articles = newsapi.get_everything(
-            q=query,
-            from_param=from_date,
-            to=to_date,
-            language='en',
-            sort_by='publishedAt', # You can also use 'relevancy' or 'popularity'
-            page_size=20 # Get top 20 articles
+        articles, errors = news.fetch_news_for_stocks(
+            NEWS_API_KEY, stock_list, from_date, to_date, queries=queries
         )
         
-        print(f"\nFound {all_articles['totalResults']} total articles.")
+        for query, e in errors:
+            print(f"Batch failed ({query[:60]}...): {e}")
+        
+        print(f"\nFound {len(articles)} unique articles.")
         
-        if all_articles['totalResults'] == 0:
+        if not articles:
             print("No news found for this query and date range.")
             return
 
         # Print the top 5 articles
         print("\n--- Top 5 Articles ---")
-        for i, article in enumerate(all_articles['articles'][:5]):
+        for i, article in enumerate(articles[:5]):
             print(f"\n{i+1}. {article['title']}")
             print(f"   Source: {article['source']['name']}")
             print(f"   Date: {article['publishedAt']}")
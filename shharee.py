@@ -10,33 +10,12 @@
 # This demonstrates that the features you want *require*
 # those libraries to be installed.
 
-# The 'datetime' library is built-in to Python,
-# so we can keep the code that uses it.
-from datetime import datetime, timedelta
-
 # --- 3. DATE HELPER FUNCTIONS ---
 # This is the only part of the original code that does not
-# require an external library to be installed.
-
-def get_date_range(period_name):
-    """
-    Returns a (from_date, to_date) tuple in ISO format (YYYY-MM-DD)
-    based on the period name.
-    """
-    today = datetime.now()
-    
-    if period_name == "last_week":
-        from_date = today - timedelta(days=7)
-    elif period_name == "last_4_weeks":
-        from_date = today - timedelta(weeks=4)
-    elif period_name == "last_3_months":
-        from_date = today - timedelta(days=90)
-    elif period_name == "last_6_months":
-        from_date = today - timedelta(days=180)
-    else:
-        from_date = today - timedelta(days=7) # Default
-
-    return from_date.strftime("%Y-%m-%d"), today.strftime("%Y-m-%d")
+# require an external library to be installed. It is shared with the
+# other apps in stock_news/dates.py, which only uses the built-in
+# 'datetime' library.
+from stock_news.dates import get_date_range
 
 # --- All other functions were removed ---
 #
@@ -4,7 +4,7 @@
 #
 # --- PREREQUISITES ---
 # You MUST install the required libraries first by running in your terminal:
-# pip install streamlit pandas newsapi-python nsetools
+# pip install streamlit pandas requests aiohttp orjson pyarrow
 #
 # --- HOW TO RUN ---
 # 1. Save this file as stock_news_app.py
@@ -16,17 +16,19 @@
 # 1. You MUST get a free API key from https://newsapi.org/
 # 2. Paste your API key into the text box in the app's sidebar.
 
+import html
 import pandas as pd
-from newsapi import NewsApiClient
-from nsetools import Nse
-from datetime import datetime, timedelta
 import streamlit as st
 
+from stock_news import news, stocks
+from stock_news.dates import get_date_range
+
 # --- 1. STOCK LIST FUNCTIONS (with Caching) ---
 # @st.cache_data tells Streamlit to store the result of these functions
 # so we don't re-download the list every time the app refreshes.
+# The lists are also saved to disk by stock_news.stocks and refreshed once a day.
 
-@st.cache_data
+@st.cache_data(ttl=stocks.CACHE_TTL_SECONDS, show_spinner=False)
 def get_fno_stocks():
     """
     Fetches the current list of F&O (Futures & Options) stocks
@@ -34,20 +36,7 @@ def get_fno_stocks():
     """
     st.write("Cache miss: Fetching F&O stock list...")
     try:
-        # This URL points to the official NSE CSV file for F&O market lots
-        fno_csv_url = "https://archives.nseindia.com/content/fo/fo_mktlots.csv"
-        
-        # Read the CSV file directly using pandas
-        # We skip the first row (index 0) which is a header
-        df = pd.read_csv(fno_csv_url, skiprows=1)
-        
-        # The stock symbols are in the second column (index 1)
-        # We'll get the column name from the data itself
-        symbol_column = df.columns[1]
-        
-        # Get the list of symbols, convert to uppercase, and remove any whitespace
-        stock_list = df[symbol_column].str.strip().str.upper().tolist()
-        
+        stock_list = stocks.get_fno_stocks()
         st.write(f"Found {len(stock_list)} F&O stocks.")
         return stock_list
     except Exception as e:
@@ -55,31 +44,18 @@ def get_fno_stocks():
         st.warning("Could not fetch F&O list. Using a small backup list.")
         return ["RELIANCE", "TCS", "INFY", "HDFCBANK", "ICICIBANK"] # Fallback
 
-@st.cache_data
+@st.cache_data(ttl=stocks.CACHE_TTL_SECONDS, show_spinner=False)
 def get_index_stocks(index_name):
     """
-    A helper function to get all stock symbols for a given Nifty index
-    using the 'nsetools' library.
+    A helper function to get all stock symbols for a given Nifty index.
     
     Valid index_name examples: 'NIFTY 50', 'NIFTY MIDCAP 150', 'NIFTY SMALLCAP 250'
     """
     st.write(f"Cache miss: Fetching stock list for {index_name}...")
     try:
-        nse = Nse()
-        if not nse.is_valid_index(index_name):
-            st.error(f"Error: Invalid index name '{index_name}'.")
-            valid_indices = nse.get_index_list()
-            st.info(f"Valid indices include: {', '.join(valid_indices)}")
-            return []
-            
-        stock_list = nse.get_stocks_in_index(index_name)
-        
-        if not stock_list:
-            st.warning(f"No stocks returned for {index_name}. Library may be out of date.")
-            return []
-            
+        stock_list = stocks.get_index_stocks(index_name)
         st.write(f"Found {len(stock_list)} stocks in {index_name}.")
-        return [stock.upper() for stock in stock_list]
+        return stock_list
     except Exception as e:
         st.error(f"Error fetching index stocks: {e}")
         return []
@@ -90,30 +66,18 @@ def get_midcap_stocks():
     return get_index_stocks("NIFTY MIDCAP 150")
 
 # --- 2. DATE HELPER FUNCTIONS ---
-
-def get_date_range(period_name):
-    """
-    Returns a (from_date, to_date) tuple in ISO format (YYYY-MM-DD)
-    based on the period name.
-    """
-    today = datetime.now()
-    
-    if period_name == "last_week":
-        from_date = today - timedelta(days=7)
-    elif period_name == "one_month":
-        from_date = today - timedelta(days=30) # Approx 1 month
-    elif period_name == "three_months":
-        from_date = today - timedelta(days=90) # Approx 3 months
-    else:
-        from_date = today - timedelta(days=7) # Default
-
-    return from_date.strftime("%Y-%m-%d"), today.strftime("%Y-%m-%d")
+# get_date_range() comes from stock_news.dates (see the imports above).
 
 # --- 3. NEWS API FUNCTION ---
 
+# Every batch can return up to 50 articles, so a long stock list can bring
+# back hundreds. Drawing them all makes the page slow, so cap the list.
+MAX_ARTICLES = 50
+
 def fetch_news_for_stocks(api_key, stock_list, from_date, to_date):
     """
     Fetches news articles for a given list of stocks within a date range.
+    The stock list is searched in batches (see stock_news.news).
     Returns a list of articles.
     """
     if not api_key:
@@ -125,35 +89,35 @@ def fetch_news_for_stocks(api_key, stock_list, from_date, to_date):
         return []
 
     # --- NewsAPI Query Limitation ---
-    # We take the first 10-15 stocks to build a query.
-    # NewsAPI queries get too long otherwise.
-    stocks_for_query = stock_list[:15]
-    # We add (stock OR market) to find more relevant articles
-    query = f"({' OR '.join(stocks_for_query)}) AND (stock OR market OR NSE OR BSE)"
+    # NewsAPI queries get too long with every stock in them, so the list
+    # is split into batches of news.STOCKS_PER_QUERY that run concurrently.
+    queries = news.build_news_queries(stock_list)
 
-    st.write(f"Fetching news with query: {query[:100]}...")
+    st.write(f"Fetching news for {len(stock_list)} stocks in {len(queries)} batches...")
     st.write(f"Date Range: {from_date} to {to_date}")
     
     try:
-        newsapi = NewsApiClient(api_key=api_key)
-        
-        with st.spinner(f"Searching for news..."):
-            all_articles = newsapi.get_everything(
-                q=query,
-                from_param=from_date,
-                to=to_date,
-                language='en',
-                sort_by='publishedAt',
-                page_size=50 # Get up to 50 articles
+        with st.spinner("Searching for news..."):
+            articles, errors = news.fetch_news_for_stocks(
+                api_key, stock_list, from_date, to_date, queries=queries
             )
+
+        if errors:
+            st.warning(
+                f"{len(errors)} of {len(queries)} batches failed, showing the rest. "
+                f"First error: {errors[0][1]}"
+            )
+
+        st.success(f"Found {len(articles)} unique articles.")
         
-        st.success(f"Found {all_articles['totalResults']} total articles.")
-        
-        if all_articles['totalResults'] == 0:
+        if not articles:
             st.info("No news found for this query and date range.")
             return []
 
-        return all_articles['articles']
+        # Articles come back newest first; only show the newest few
+        if len(articles) > MAX_ARTICLES:
+            st.info(f"Showing the newest {MAX_ARTICLES} articles.")
+        return articles[:MAX_ARTICLES]
 
     except Exception as e:
         st.error(f"Error fetching news from NewsAPI: {e}")
@@ -229,21 +193,30 @@ if st.sidebar.button("Get News", type="primary"):
     # 4. Display articles
     if articles:
         st.subheader(f"Showing Top {len(articles)} Articles")
+
+        # Format all publish dates in one vectorized call
+        published = pd.to_datetime(
+            [a['publishedAt'] for a in articles], utc=True, format="ISO8601"
+        ).strftime('%d-%b-%Y %H:%M')
         
-        for article in articles:
+        for i, article in enumerate(articles):
             with st.container(border=True):
                 col1, col2 = st.columns([3, 1])
                 with col1:
                     st.write(f"**{article['title']}**")
-                    st.write(f"Source: {article['source']['name']} | Published: {pd.to_datetime(article['publishedAt']).strftime('%d-%b-%Y %H:%M')}")
+                    st.write(f"Source: {article['source']['name']} | Published: {published[i]}")
                     
                     if article['description']:
                         st.write(article['description'])
                         
                     st.markdown(f"[Read Full Article]({article['url']})", unsafe_allow_html=True)
                 with col2:
-                    if article['urlToImage']:
-                        st.image(article['urlToImage'], use_column_width=True)
+                    # Plain <img> tag: the browser fetches the image itself and
+                    # skips off-screen ones, instead of Streamlit proxying every image
+                    url = article.get('urlToImage')
+                    if url:
+                        st.markdown(f'<img src="{html.escape(url)}" loading="lazy" style="width:100%">',
+                                    unsafe_allow_html=True)
     else:
         st.info("No articles found to display.")
 
@@ -0,0 +1,8 @@
+# stock_news
+#
+# Shared code for the stock news apps (hello.py, share.py, ...).
+#
+# - stock_news.dates:     date range helpers (no external libraries needed)
+# - stock_news.stocks:    NSE stock lists (F&O and Nifty indices)
+# - stock_news.news:      batched NewsAPI fetching
+# - stock_news.sentiment: sentiment analysis (needs numba and vaderSentiment)
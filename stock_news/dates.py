@@ -0,0 +1,28 @@
+# stock_news/dates.py
+#
+# Date helpers for the NewsAPI 'from' and 'to' parameters.
+# Only uses the built-in 'datetime' library, so it can be imported
+# without any of the other app dependencies installed.
+
+from datetime import datetime, timedelta
+
+# How far back each period goes
+_PERIOD_DELTAS = {
+    "last_week": timedelta(days=7),
+    "last_4_weeks": timedelta(weeks=4),
+    "one_month": timedelta(days=30),  # Approx 1 month
+    "last_3_months": timedelta(days=90),  # Approximation for 3 months
+    "three_months": timedelta(days=90),
+    "last_6_months": timedelta(days=180),  # Approximation for 6 months
+}
+
+def get_date_range(period_name):
+    """
+    Returns a (from_date, to_date) tuple in ISO format (YYYY-MM-DD)
+    based on the period name.
+    """
+    today = datetime.now()
+    # Unknown period names default to the last 7 days
+    delta = _PERIOD_DELTAS.get(period_name, _PERIOD_DELTAS["last_week"])
+    fmt = "%Y-%m-%d"
+    return (today - delta).strftime(fmt), today.strftime(fmt)
@@ -0,0 +1,109 @@
+# stock_news/news.py
+#
+# Fetches news from NewsAPI for a list of stocks. The list is split into
+# batches (NewsAPI limits query length) that are searched concurrently.
+#
+# Nothing in here prints or talks to Streamlit. Functions return data and
+# raise exceptions on failure; the apps decide how to show them.
+#
+# --- PREREQUISITES ---
+# pip install aiohttp orjson
+
+import asyncio
+import aiohttp
+import orjson
+
+# --- 1. NEWS API FUNCTIONS ---
+
+NEWSAPI_URL = "https://newsapi.org/v2/everything"
+
+# NewsAPI limits query length, so we search in batches of this many stocks
+STOCKS_PER_QUERY = 15
+
+# Max requests in flight at once (keeps us under the free-tier rate limit)
+MAX_CONCURRENT_REQUESTS = 5
+
+# Per-request limit, so one stalled batch fails on its own after a few
+# seconds instead of holding everything for aiohttp's default five minutes
+REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=15)
+
+def build_news_queries(stock_list):
+    """
+    Splits the stock list into batches and builds one NewsAPI query per batch,
+    e.g. "(RELIANCE OR TCS OR INFY) AND (stock OR market OR NSE OR BSE)".
+    """
+    return [
+        f"({' OR '.join(stock_list[i:i + STOCKS_PER_QUERY])}) AND (stock OR market OR NSE OR BSE)"
+        for i in range(0, len(stock_list), STOCKS_PER_QUERY)
+    ]
+
+async def _fetch_chunk(session, sem, api_key, query, from_date, to_date):
+    """
+    Fetches one page of articles for a single batch query.
+    """
+    params = {
+        "q": query,
+        "from": from_date,
+        "to": to_date,
+        "language": "en",
+        "sortBy": "publishedAt",
+        "pageSize": 50,
+    }
+    async with sem:
+        async with session.get(NEWSAPI_URL, params=params, headers={"X-Api-Key": api_key}) as resp:
+            data = orjson.loads(await resp.read())
+
+    if data.get('status') != 'ok':
+        # Same shape as the errors raised by newsapi-python, e.g. 'apiKeyInvalid'
+        raise Exception(f"{data.get('code')}: {data.get('message')}")
+    return data
+
+async def _fetch_all_chunks(api_key, queries, from_date, to_date):
+    """
+    Runs all batch queries concurrently over one shared HTTP session.
+    Failed batches come back as the exception instead of the response.
+    """
+    sem = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+    async with aiohttp.ClientSession(timeout=REQUEST_TIMEOUT) as session:
+        return await asyncio.gather(
+            *[_fetch_chunk(session, sem, api_key, q, from_date, to_date) for q in queries],
+            return_exceptions=True
+        )
+
+def fetch_news_for_stocks(api_key, stock_list, from_date, to_date, queries=None):
+    """
+    Fetches news articles for a given list of stocks within a date range.
+    The stock list is split into batches that are searched concurrently.
+    Pass `queries` (from build_news_queries) to reuse already-built queries.
+    Returns (articles, errors): the articles, deduplicated by URL and sorted
+    newest first, and a list of (query, exception) for batches that failed.
+    One failed batch (e.g. 'rateLimited') doesn't discard the others;
+    only if every batch fails is the first error raised.
+    """
+    if queries is None:
+        queries = build_news_queries(stock_list)
+
+    responses = asyncio.run(_fetch_all_chunks(api_key, queries, from_date, to_date))
+
+    results = []
+    errors = []
+    for query, r in zip(queries, responses):
+        if isinstance(r, Exception):
+            errors.append((query, r))
+        else:
+            results.append(r)
+    if errors and not results:
+        raise errors[0][1]
+
+    # The same article can match several batches, so keep only the
+    # first copy of each URL (a dict lookup per article, not a list scan)
+    seen = {}
+    for r in results:
+        for a in r['articles']:
+            u = a.get('url')
+            if u and u not in seen:
+                seen[u] = a
+
+    # Newest first, like a single sortBy=publishedAt query
+    articles = sorted(seen.values(), key=lambda a: a['publishedAt'], reverse=True)
+    return articles, errors
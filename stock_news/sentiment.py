@@ -0,0 +1,153 @@
+# stock_news/sentiment.py
+#
+# Sentiment analysis for article titles, based on the VADER lexicon.
+# Kept apart from the other modules so only the apps that show
+# sentiment need numba and vaderSentiment installed.
+#
+# --- PREREQUISITES ---
+# pip install numpy numba vaderSentiment
+
+import numpy as np
+import string
+from numba import njit
+from functools import lru_cache
+from vaderSentiment.vaderSentiment import NEGATE, N_SCALAR, SentimentIntensityAnalyzer
+
+# --- 1. SENTIMENT FUNCTIONS ---
+
+# The VADER analyzer loads its whole lexicon when created, so build it
+# once per process instead of on every call.
+@lru_cache(maxsize=None)
+def _get_analyzer():
+    return SentimentIntensityAnalyzer()
+
+# Label/emoji lookup tables, indexed by the codes from score_titles()
+SENTIMENT_LABELS = ("Positive", "Negative", "Neutral")
+SENTIMENT_EMOJIS = ("🟢", "🔴", "⚪")
+
+@lru_cache(maxsize=None)
+def _get_lexicon_table():
+    """
+    Packs the VADER lexicon into a word -> id dict plus a float32 array
+    of scores, so the scoring kernel only has to deal with numbers.
+    """
+    lexicon = _get_analyzer().lexicon
+    word_to_id = {w: i for i, w in enumerate(lexicon)}
+    scores_arr = np.fromiter(lexicon.values(), dtype=np.float32, count=len(lexicon))
+    return word_to_id, scores_arr
+
+_NEGATE = frozenset(NEGATE)
+
+def _is_negation(word):
+    return word in _NEGATE or "n't" in word
+
+def _tokenize_titles(titles, word_to_id):
+    """
+    Turns titles into a flat array of lexicon ids (-1 if a word is not in
+    the lexicon), a matching array of weights, and offsets marking where
+    each title's tokens start.
+
+    The weights apply VADER's negation rule: a word's score is scaled by
+    N_SCALAR (-0.74) for each negation among the three words before it,
+    so "not rising" counts as negative.
+    """
+    offsets = np.zeros(len(titles) + 1, dtype=np.int64)
+    tok_ids = []
+    weights = []
+    for i, title in enumerate(titles):
+        words = [w.strip(string.punctuation).lower() for w in (title or "").split()]
+        for j, word in enumerate(words):
+            weight = 1.0
+            for prev in words[max(0, j - 3):j]:
+                if _is_negation(prev):
+                    weight *= N_SCALAR
+            tok_ids.append(word_to_id.get(word, -1))
+            weights.append(weight)
+        offsets[i + 1] = len(tok_ids)
+    return offsets, np.array(tok_ids, dtype=np.int32), np.array(weights, dtype=np.float32)
+
+# A plain serial loop: a page of titles is far too small for parallel=True
+# to pay off, and it keeps the one-off compile short.
+@njit(fastmath=True, cache=True)
+def _batch_compound(offsets, tok_ids, weights, scores_arr, out):
+    """
+    Sums weighted lexicon scores per title and normalizes to -1..1 like
+    VADER's compound score (alpha = 15).
+    """
+    for i in range(len(out)):
+        s = 0.0
+        for j in range(offsets[i], offsets[i + 1]):
+            tid = tok_ids[j]
+            if tid >= 0:
+                s += scores_arr[tid] * weights[j]
+        out[i] = s / np.sqrt(s * s + 15.0)
+
+def score_titles(titles):
+    """
+    Scores a whole list of titles in one pass.
+    Returns an array of label codes: 0 = Positive, 1 = Negative, 2 = Neutral.
+
+    This is an approximation of VADER: lexicon sums with its negation rule,
+    but no booster, "but", caps or punctuation rules. Run this module
+    directly to see how often it agrees with full VADER on sample headlines.
+    """
+    return _score_title_tuple(tuple(titles))
+
+# Memoized on the titles themselves, so a rerun over the same articles
+# (e.g. a page reload) skips tokenizing and scoring entirely.
+@lru_cache(maxsize=64)
+def _score_title_tuple(titles):
+    word_to_id, scores_arr = _get_lexicon_table()
+    offsets, tok_ids, weights = _tokenize_titles(titles, word_to_id)
+    scores = np.empty(len(titles), dtype=np.float32)
+    _batch_compound(offsets, tok_ids, weights, scores_arr, scores)
+    codes = np.where(scores >= 0.05, 0, np.where(scores <= -0.05, 1, 2))
+    # The same array is handed to every caller, so don't let one modify it
+    codes.flags.writeable = False
+    return codes
+
+def _vader_label_codes(titles):
+    """
+    Label codes for the same titles from full VADER (polarity_scores).
+    """
+    analyzer = _get_analyzer()
+    scores = np.array([analyzer.polarity_scores(t)['compound'] for t in titles])
+    return np.where(scores >= 0.05, 0, np.where(scores <= -0.05, 1, 2))
+
+def vader_agreement(titles):
+    """
+    Returns the fraction of titles where score_titles() gives the same
+    label as full VADER, plus the list of titles where they differ.
+    An empty list counts as full agreement.
+    """
+    if not titles:
+        return 1.0, []
+    ours = score_titles(titles)
+    vader = _vader_label_codes(titles)
+    differ = [t for t, a, b in zip(titles, ours, vader) if a != b]
+    return 1.0 - len(differ) / len(titles), differ
+
+# Check how close score_titles() is to VADER on some typical headlines:
+# python -m stock_news.sentiment
+if __name__ == "__main__":
+    sample_headlines = [
+        "Sensex not rising as banks drag markets lower",
+        "Reliance shares surge after strong quarterly results",
+        "TCS profit falls short of estimates, stock slumps",
+        "Infosys wins big deal, investors cheer",
+        "HDFC Bank does not expect margin pressure to ease",
+        "Nifty ends flat ahead of RBI policy meeting",
+        "Tata Motors recalls vehicles over safety concerns",
+        "ICICI Bank isn't worried about bad loans, says CEO",
+        "Adani stocks crash after fraud allegations",
+        "Markets rally as inflation eases, but risks remain",
+        "SBI reports record profit, beats expectations",
+        "Weak global cues hurt Indian equities",
+        "No relief for telecom stocks as losses widen",
+        "Wipro shares gain on upbeat guidance",
+        "Investors fear fresh selloff amid rising bond yields",
+    ]
+    agreement, differ = vader_agreement(sample_headlines)
+    print(f"score_titles agrees with VADER on {agreement:.0%} of {len(sample_headlines)} headlines.")
+    for title in differ:
+        print(f"  differs: {title}")
@@ -0,0 +1,171 @@
+# stock_news/stocks.py
+#
+# Stock lists for the apps: the NSE F&O list and the Nifty index lists.
+# Lists are kept in a small parquet disk cache and refreshed once a day.
+#
+# Nothing in here prints or talks to Streamlit. Functions return data and
+# raise exceptions on failure; the apps decide how to show them.
+#
+# --- PREREQUISITES ---
+# pip install requests aiohttp orjson pyarrow
+
+import asyncio
+import aiohttp
+import orjson
+import os
+import time
+import csv
+import io
+import requests
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# --- 1. DISK CACHE FOR STOCK LISTS ---
+# Each list is kept in a small parquet file, so a fresh process can skip
+# the NSE download entirely. Files older than a day are refetched.
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".streamlit", "cache")
+CACHE_TTL_SECONDS = 24 * 3600
+
+def _list_cache_path(name):
+    return os.path.join(CACHE_DIR, f"{name}.parquet")
+
+def _read_list_cache(name):
+    """
+    Returns the cached list for `name`, or None if missing or older than a day.
+    """
+    path = _list_cache_path(name)
+    try:
+        if time.time() - os.path.getmtime(path) > CACHE_TTL_SECONDS:
+            return None
+        return pq.read_table(path).column(0).to_pylist()
+    except Exception:
+        return None
+
+def _write_list_cache(name, items):
+    """
+    Saves a list of symbols to disk. Failures are ignored (cache is optional).
+    """
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        pq.write_table(pa.table({"symbol": items}), _list_cache_path(name))
+    except Exception:
+        pass
+
+# --- 2. STOCK LIST FUNCTIONS ---
+
+FNO_CSV_URL = "https://archives.nseindia.com/content/fo/fo_mktlots.csv"
+
+def get_fno_stocks():
+    """
+    Returns the current list of F&O (Futures & Options) stocks
+    from the NSE website (or the disk cache).
+    """
+    stock_list = _read_list_cache("fno")
+    if stock_list:
+        return stock_list
+
+    response = requests.get(FNO_CSV_URL, timeout=10)
+    response.raise_for_status()
+    reader = csv.reader(io.StringIO(response.text))
+    next(reader)
+    next(reader)  # Skip both header rows
+    stock_list = [row[1].strip().upper() for row in reader if len(row) > 1 and row[1].strip()]
+    _write_list_cache("fno", stock_list)
+    return stock_list
+
+# Indices offered by the apps, prefetched together by get_all_index_stocks().
+# get_index_stocks() accepts any NSE index name, e.g. 'NIFTY 50'.
+INDEX_NAMES = ("NIFTY 100", "NIFTY MIDCAP 150", "NIFTY SMALLCAP 250")
+
+NSE_HOME_URL = "https://www.nseindia.com"
+NSE_INDEX_URL = "https://www.nseindia.com/api/equity-stockIndices"
+# NSE rejects requests that don't look like they come from a browser
+NSE_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+                  "(KHTML, like Gecko) Chrome/120.0 Safari/537.36",
+    "Accept": "application/json, text/plain, */*",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+# NSE often stalls non-browser clients instead of refusing them, so give
+# up after a few seconds rather than aiohttp's default of five minutes
+NSE_TIMEOUT = aiohttp.ClientTimeout(total=10)
+
+def _index_cache_name(index_name):
+    return "index_" + index_name.lower().replace(" ", "_")
+
+async def _fetch_index(session, index_name):
+    """
+    Fetches the symbols in one index from NSE's JSON API.
+    """
+    async with session.get(NSE_INDEX_URL, params={"index": index_name}) as resp:
+        resp.raise_for_status()
+        data = orjson.loads(await resp.read())
+    # The first row is the index itself, not a stock
+    return [row['symbol'].upper() for row in data['data'] if row['symbol'] != index_name]
+
+async def _fetch_indices(index_names):
+    """
+    Fetches several indices concurrently. Failed indices come back as
+    the exception instead of a list.
+    """
+    async with aiohttp.ClientSession(headers=NSE_HEADERS, timeout=NSE_TIMEOUT) as session:
+        # The API only answers once the home page has set its cookies
+        async with session.get(NSE_HOME_URL) as resp:
+            resp.raise_for_status()
+        return await asyncio.gather(
+            *[_fetch_index(session, name) for name in index_names],
+            return_exceptions=True
+        )
+
+def _load_indices(index_names):
+    """
+    Gets the stock lists for the given indices. Anything not in the disk
+    cache is fetched from NSE in one concurrent batch.
+    Returns (index_stocks, errors): dicts of index name -> list of symbols
+    and index name -> exception for the indices that could not be fetched.
+    """
+    index_stocks = {}
+    errors = {}
+    missing = []
+    for index_name in index_names:
+        stock_list = _read_list_cache(_index_cache_name(index_name))
+        if stock_list:
+            index_stocks[index_name] = stock_list
+        else:
+            missing.append(index_name)
+
+    if not missing:
+        return index_stocks, errors
+
+    try:
+        results = asyncio.run(_fetch_indices(missing))
+    except Exception as e:
+        return index_stocks, {index_name: e for index_name in missing}
+
+    for index_name, stock_list in zip(missing, results):
+        if isinstance(stock_list, Exception):
+            errors[index_name] = stock_list
+        elif not stock_list:
+            errors[index_name] = ValueError(f"No stocks returned for {index_name}.")
+        else:
+            _write_list_cache(_index_cache_name(index_name), stock_list)
+            index_stocks[index_name] = stock_list
+    return index_stocks, errors
+
+def get_all_index_stocks():
+    """
+    Gets the stock lists for every index in INDEX_NAMES in one go.
+    Returns (index_stocks, errors), see _load_indices().
+    """
+    return _load_indices(INDEX_NAMES)
+
+def get_index_stocks(index_name):
+    """
+    Returns all stock symbols for a given NSE index, e.g. 'NIFTY 50'.
+    Only the requested index is fetched. Raises on failure, including
+    ValueError when NSE returns no stocks (e.g. an unknown index name).
+    """
+    index_stocks, errors = _load_indices([index_name])
+    if index_name in errors:
+        raise errors[index_name]
+    return index_stocks[index_name]